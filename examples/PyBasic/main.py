@@ -22,7 +22,7 @@ import asyncio
 import os
 import sys
 
-from chat import run_chat
+from chat import prewarm_client, run_chat
 
 from agent_backend import (
     ConnectionStatus,
@@ -94,16 +94,20 @@ async def main() -> None:
 
     backend.on_status_change(on_status)
 
-    # Smoke-test file operations (exercises ssh-over-ws for remote backends)
+    # Smoke-test file operations (exercises ssh-over-ws for remote backends).
+    # The write must land before readdir; everything else is independent, so
+    # overlap the remaining round-trips instead of awaiting them one by one.
+    adapter = VercelAIAdapter(backend)
     await backend.write("test.txt", "Hello World")
-    cwd = await backend.exec("pwd")
-    files = await backend.readdir(".")
+    cwd, files, session, _ = await asyncio.gather(
+        backend.exec("pwd"),
+        backend.readdir("."),
+        adapter.get_mcp_client(),
+        prewarm_client(),
+    )
     print(f"Workspace: {cwd.strip()}")
     print(f"Files: {', '.join(files) or '(empty)'}")
 
-    # Get MCP client and list tools
-    adapter = VercelAIAdapter(backend)
-    session = await adapter.get_mcp_client()
     tools_result = await session.list_tools()
     tool_names = [t.name for t in tools_result.tools]
 
@@ -118,6 +122,13 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    try:  # opt-in speedup — this program is dominated by network/pipe I/O
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -5,11 +5,18 @@ Wraps a backend and exposes its MCP tools in the format expected by the AI SDK.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import httpx
+from mcp import ClientSession
+from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamable_http_client
 
+# Headers the adapter sets per transport; a caller-supplied client is only
+# reused when its values for these match the requested ones exactly.
+_MANAGED_HEADERS = ("Authorization", "X-Root-Dir", "X-Scope-Path")
+
 
 class VercelAIAdapter:
     """Adapter for creating Vercel AI SDK MCP clients from agent-backend backends.
@@ -23,9 +30,12 @@ class VercelAIAdapter:
         backend: Any,
         *,
         connection_timeout_ms: int = 15000,
+        http_client: httpx.AsyncClient | None = None,
     ) -> None:
         self._backend = backend
         self._connection_timeout_ms = connection_timeout_ms
+        self._http_client = http_client  # caller-supplied, never closed by us
+        self._http_clients: dict[tuple[tuple[str, str], ...], httpx.AsyncClient] = {}
 
     async def get_mcp_client(self) -> Any:
         """Get a Vercel AI SDK-compatible MCP client.
@@ -36,8 +46,6 @@ class VercelAIAdapter:
         Raises:
             TimeoutError: If connection times out.
         """
-        import asyncio
-
         transport = await self._backend.get_mcp_transport()
 
         try:
@@ -55,9 +63,6 @@ class VercelAIAdapter:
 
     async def _create_client(self, transport: Any) -> Any:
         """Create the MCP client from transport."""
-        from mcp import ClientSession
-        from mcp.client.stdio import stdio_client
-
         # If it's a stdio wrapper, use stdio_client
         if hasattr(transport, "params"):
             stdio_ctx = stdio_client(transport.params)
@@ -81,7 +86,7 @@ class VercelAIAdapter:
 
             http_ctx = streamable_http_client(
                 f"{transport.url}/mcp",
-                http_client=httpx.AsyncClient(headers=headers),
+                http_client=self._get_http_client(headers),
             )
             read_stream, write_stream, _ = await http_ctx.__aenter__()
             session = ClientSession(read_stream, write_stream)
@@ -92,3 +97,41 @@ class VercelAIAdapter:
             return session
 
         raise ValueError(f"Unsupported transport type: {type(transport)}")
+
+    def _get_http_client(self, headers: dict[str, str]) -> httpx.AsyncClient:
+        """Return a pooled HTTP client for this exact header set.
+
+        Reusing a client keeps TCP+TLS connections alive across reconnects
+        and sessions instead of paying a fresh handshake per get_mcp_client.
+        Clients are keyed by their headers (mirroring the shared pool in
+        mcp_integration.client): scoped transports carry different auth and
+        scope values, and mutating one shared client's defaults would let a
+        previous session's scope or token ride along on the next session.
+        """
+        if self._http_client is not None and all(
+            self._http_client.headers.get(k) == headers.get(k) for k in _MANAGED_HEADERS
+        ):
+            return self._http_client
+        key = tuple(sorted(headers.items()))
+        client = self._http_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers=headers,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            )
+            if not self._http_clients:
+                self._backend.track_closeable(self)
+            self._http_clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients (never a caller-supplied one)."""
+        clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+
+    async def close(self) -> None:
+        """Closeable protocol hook — lets backends close the adapter on destroy."""
+        await self.aclose()
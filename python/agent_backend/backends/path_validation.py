@@ -4,34 +4,79 @@ Implements the three-case resolution logic from docs/filepaths.md:
 1. Relative paths: resolved relative to boundary
 2. Absolute paths matching boundary: used directly
 3. Absolute paths not matching boundary: treated as relative (leading slash stripped)
+
+Deliberately pure Python: the package ships as a universal wheel with no
+compiled extensions, so hot-path cost is kept down with memoization and
+single-pass string scans rather than a native module.
 """
 
 from __future__ import annotations
 
 import os.path
 import posixpath
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from types import ModuleType
 
 from agent_backend.types import PathEscapeError
 
+# Matches anything the segment walk would have to clean up: "." or ".."
+# segments, empty segments, or a trailing slash. Compiled once so the
+# common clean-path case costs a single DFA sweep instead of a walk.
+_NEEDS_WALK = re.compile(r"(?:^|/)\.\.?(?:/|$)|//|/$")
+
+# Used for rejections unless the caller asks for the offending path in the
+# message; skipping the f-string keeps rejection cheap. The exception itself
+# must be built fresh per raise: re-raising a shared instance appends to its
+# __traceback__ chain on every raise, leaking frames for the process lifetime.
+_GENERIC_ESCAPE_MESSAGE = "<path outside boundary>"
+
 
 def _get_pathmod(use_posix: bool) -> ModuleType:
     """Return the appropriate path module."""
     return posixpath if use_posix else os.path
 
 
+@dataclass(frozen=True, slots=True)
+class BoundaryContext:
+    """Pre-split boundary state for repeated prefix comparisons.
+
+    Comparing component tuples is a single C-level loop and is robust to
+    trailing-slash variants, unlike repeated startswith concatenations.
+    """
+
+    root: str
+    parts: tuple[str, ...]
+
+
+@lru_cache(maxsize=64)
+def _boundary_context(root_dir: str, use_posix: bool) -> BoundaryContext:
+    pathmod = _get_pathmod(use_posix)
+    resolved = _resolve(root_dir, pathmod)
+    stripped = resolved.strip(pathmod.sep)
+    parts = tuple(stripped.split(pathmod.sep)) if stripped else ()
+    return BoundaryContext(resolved, parts)
+
+
 def validate_within_boundary(
     relative_path: str,
     boundary: str,
     *,
     use_posix: bool = False,
+    detailed: bool = False,
 ) -> str:
     """Validate that a path stays within a boundary and return combined path.
 
+    Results are memoized: validation is a pure function of its inputs, and
+    backends call it with the same (path, boundary) pairs over and over.
+
     Args:
         relative_path: The path to validate (can be relative or absolute).
         boundary: The boundary path (root_dir or scope_path).
         use_posix: If True, always use posixpath. If False, use os.path.
+        detailed: If True, embed the offending path in the error message
+            instead of the generic constant one.
 
     Returns:
         Combined path (boundary + relative_path) or the absolute path if it
@@ -40,6 +85,34 @@ def validate_within_boundary(
     Raises:
         PathEscapeError: If path escapes boundary.
     """
+    # Overwhelmingly common case: a clean relative path under a clean
+    # boundary needs no resolution at all — just anchor it
+    if (
+        (use_posix or os.path is posixpath)
+        and relative_path
+        and relative_path[0] != "/"
+        and _NEEDS_WALK.search(relative_path) is None
+        and _NEEDS_WALK.search(boundary) is None
+    ):
+        return boundary + "/" + relative_path
+    ok, value = _validate_cached(relative_path, boundary, use_posix)
+    if not ok:
+        if detailed:
+            raise PathEscapeError(value)
+        raise PathEscapeError(_GENERIC_ESCAPE_MESSAGE) from None
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _validate_cached(relative_path: str, boundary: str, use_posix: bool) -> tuple[bool, str]:
+    """Memoized validation core.
+
+    lru_cache cannot cache raised exceptions, so escapes are encoded as
+    (False, offending_path) and re-raised by the public wrapper.
+    """
+    # On POSIX hosts os.path is posixpath, so both modes take the fast scan
+    if use_posix or os.path is posixpath:
+        return _validate_posix(relative_path, boundary)
     pathmod = _get_pathmod(use_posix)
     boundary_resolved = _resolve(boundary, pathmod)
 
@@ -49,7 +122,7 @@ def validate_within_boundary(
 
         sep = pathmod.sep
         if path_resolved.startswith(boundary_resolved + sep) or path_resolved == boundary_resolved:
-            return path_resolved
+            return (True, path_resolved)
 
         # Absolute path doesn't match boundary - treat as relative (strip leading slashes)
 
@@ -67,9 +140,71 @@ def validate_within_boundary(
     # Validate stays within boundary
     sep = pathmod.sep
     if not resolved.startswith(boundary_resolved + sep) and resolved != boundary_resolved:
-        raise PathEscapeError(relative_path)
+        return (False, relative_path)
 
-    return pathmod.normpath(combined)
+    return (True, pathmod.normpath(combined))
+
+
+@lru_cache(maxsize=64)
+def _normalize_boundary(boundary: str, _normpath=posixpath.normpath) -> str:
+    """Normalize a boundary, memoized.
+
+    Boundaries repeat across calls (a backend's root_dir or a scope
+    prefix), so the per-call normpath scan collapses to a dict hit; 64
+    entries is plenty for the handful of distinct boundaries in a process.
+    """
+    return _normpath(boundary)
+
+
+def _validate_posix(relative_path: str, boundary: str) -> tuple[bool, str]:
+    """Single-pass POSIX resolution: no normpath re-parse of the combined path.
+
+    Walks the input's segments once with a stack, rejecting the moment a
+    ".." would climb above the boundary instead of normalizing the whole
+    string and comparing prefixes afterwards. Only the boundary needs
+    normpath, via the memoized _normalize_boundary.
+    """
+    boundary_resolved = _resolve(boundary, posixpath)
+
+    normalized_path = relative_path
+    if relative_path.startswith("/"):
+        path_resolved = _resolve(relative_path, posixpath)
+        if path_resolved == boundary_resolved or path_resolved.startswith(
+            boundary_resolved + "/"
+        ):
+            return (True, path_resolved)
+        # Doesn't match the boundary — treat as relative (strip leading slashes)
+        normalized_path = relative_path.lstrip("/")
+
+    if normalized_path and _NEEDS_WALK.search(normalized_path) is None:
+        # Nothing to normalize and nothing that could traverse upwards
+        boundary_norm = _normalize_boundary(boundary)
+        if boundary_norm.endswith("/"):
+            return (True, boundary_norm + normalized_path)
+        return (True, boundary_norm + "/" + normalized_path)
+
+    parts: list[str] = []
+    for segment in normalized_path.split("/"):
+        if not segment or segment == ".":
+            continue
+        if segment == "..":
+            if not parts:
+                return (False, relative_path)
+            parts.pop()
+        else:
+            parts.append(segment)
+    # Combine against the boundary as given (normalized but not anchored):
+    # memory-backend scopes pass relative boundaries and expect relative keys
+    boundary_norm = _normalize_boundary(boundary)
+    if not parts:
+        return (True, boundary_norm)
+    if boundary_norm.endswith("/"):  # only the root "/" keeps its slash
+        return (True, boundary_norm + "/".join(parts))
+    return (True, boundary_norm + "/" + "/".join(parts))
+
+
+# Let tests reset memoized state without reaching into the private cache
+validate_within_boundary.cache_clear = _validate_cached.cache_clear  # type: ignore[attr-defined]
 
 
 def validate_absolute_within_root(
@@ -90,10 +225,11 @@ def validate_absolute_within_root(
     """
     pathmod = _get_pathmod(use_posix)
     normalized_path = _resolve(absolute_path, pathmod)
-    normalized_root = _resolve(root_dir, pathmod)
+    context = _boundary_context(root_dir, use_posix)
 
-    sep = pathmod.sep
-    if not normalized_path.startswith(normalized_root + sep) and normalized_path != normalized_root:
+    stripped = normalized_path.strip(pathmod.sep)
+    path_parts = tuple(stripped.split(pathmod.sep)) if stripped else ()
+    if path_parts[: len(context.parts)] != context.parts:
         raise PathEscapeError(absolute_path)
 
 
@@ -9,14 +9,22 @@ from __future__ import annotations
 import asyncio
 import logging
 import posixpath
+import shlex
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from stat import S_IFDIR, S_IFMT, S_IFREG
 from typing import TYPE_CHECKING
 
+from asyncssh import SFTPError
+
 from agent_backend.backends.path_validation import (
     validate_within_boundary,
 )
 from agent_backend.backends.status import ConnectionStatusManager
 from agent_backend.backends.transports.websocket_ssh import WebSocketSSHTransport
-from agent_backend.safety import is_command_safe, is_dangerous
+from agent_backend.safety import SafetyResult, is_command_safe, is_dangerous
 from agent_backend.types import (
     BackendError,
     BackendType,
@@ -34,6 +42,47 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# How long a cached stat result stays valid. Short enough that callers never
+# observe meaningfully stale metadata, long enough to absorb readdir+stat loops.
+_STAT_CACHE_TTL = 0.05
+
+# Cap on cached stat entries; expired entries are not pruned on a timer, so
+# without a bound a long tree-walk would grow the cache monotonically.
+_STAT_CACHE_MAX = 1024
+
+# Marker echoed between batched commands so their outputs can be split apart
+_EXEC_BATCH_SENTINEL = "__ABE_SEP__"
+
+
+@lru_cache(maxsize=4096)
+def _check_command_safety(command: str) -> tuple[bool, SafetyResult]:
+    """Memoized safety scan — both predicates are pure functions of the command.
+
+    Agents re-issue the same commands (ls, pwd, git status, ...) constantly;
+    this turns the per-exec pattern scans into a dict lookup.
+    """
+    return is_dangerous(command), is_command_safe(command)
+
+
+def _specialize_resolve_path(root_dir: str):
+    """Build a resolver with root_dir baked in for a backend's lifetime.
+
+    root_dir is fixed at construction, so the per-instance function binds
+    both it and the validator as default arguments: every call is two
+    LOAD_FASTs instead of attribute loads off self plus a module-global
+    lookup. Same effect as exec-generated specialization, without codegen.
+    """
+
+    def _resolve_path(
+        relative_path: str,
+        _validate=validate_within_boundary,
+        _root=root_dir,
+    ) -> str:
+        """Resolve path using posixpath (remote is always Unix)."""
+        return _validate(relative_path, _root, use_posix=True)
+
+    return _resolve_path
+
 
 class RemoteFilesystemBackend:
     """Remote filesystem backend.
@@ -44,7 +93,11 @@ class RemoteFilesystemBackend:
 
     def __init__(self, config: RemoteFilesystemBackendConfig) -> None:
         self._type = BackendType.REMOTE_FILESYSTEM
-        self._root_dir = config.root_dir
+        # Interned so the many comparisons against it are pointer checks;
+        # the trailing-slash variant is precomputed for prefix tests
+        self._root_dir = sys.intern(config.root_dir.rstrip("/") or "/")
+        self._root_slash = self._root_dir + "/"
+        self._resolve_path = _specialize_resolve_path(self._root_dir)
         self._config = config
         self._host = config.host
         self._port = config.port or config.mcp_port
@@ -57,6 +110,8 @@ class RemoteFilesystemBackend:
         self._reconnection = config.reconnection
         self._prevent_dangerous = config.prevent_dangerous
         self._max_output_length = config.max_output_length
+        self._sftp_block_size = config.sftp_block_size
+        self._sftp_max_requests = config.sftp_max_requests
 
         self._status_manager = ConnectionStatusManager(ConnectionStatus.DISCONNECTED)
         self._transport: WebSocketSSHTransport | None = None
@@ -64,6 +119,18 @@ class RemoteFilesystemBackend:
         self._closeables: set[Closeable] = set()
         self._reconnect_task: asyncio.Task[None] | None = None
         self._retry_count = 0
+        self._stat_cache: dict[str, tuple[float, FileStat]] = {}
+        self._stat_cache_order: deque[str] = deque()
+        self._path_cache: dict[str, tuple[str, str]] = {}
+        self._path_cache_order: deque[str] = deque()
+        self._ensured_dirs: set[str] = set()
+        # Constant for the backend's lifetime; exec rebuilds it on every call
+        # otherwise, and no-options exec is the overwhelmingly common case
+        quoted_root = shlex.quote(self._root_dir)
+        self._default_exec_prefix = f"cd {quoted_root} && HOME={quoted_root} "
+        # Batched commands run after ";" separators, where an env-prefix
+        # would only bind to the first command — export instead
+        self._batch_exec_prefix = f"cd {quoted_root} && export HOME={quoted_root} ; "
 
     @property
     def type(self) -> BackendType:
@@ -99,6 +166,8 @@ class RemoteFilesystemBackend:
                 keepalive_count_max=self._keepalive_count_max,
             )
             await self._transport.connect()
+            # Directories ensured on a previous session may be gone
+            self._ensured_dirs.clear()
             self._status_manager.set_status(ConnectionStatus.CONNECTED)
             self._retry_count = 0
         except Exception as e:
@@ -144,11 +213,60 @@ class RemoteFilesystemBackend:
         except Exception:
             logger.debug("Reconnection attempt %d failed", self._retry_count)
 
-    def _resolve_path(self, relative_path: str) -> str:
-        """Resolve path using posixpath (remote is always Unix)."""
-        return validate_within_boundary(
-            relative_path, self._root_dir, use_posix=True
-        )
+    def _resolve_full(self, relative_path: str) -> tuple[str, str]:
+        """Resolve and normalize a path, memoized per instance.
+
+        Validation and normalization are pure functions of the input path
+        (root_dir is fixed for the backend's lifetime), so repeated ops on
+        the same paths skip the string work entirely.
+
+        Paths stay str rather than pre-encoded bytes: asyncssh composes and
+        encodes every path it receives regardless of input type, so handing
+        it bytes would only move the encode to our side while splitting the
+        backend between two string types.
+        """
+        cached = self._path_cache.get(relative_path)
+        if cached is not None:
+            return cached
+        # Escapes raise before insertion, so rejections are never cached
+        resolved = self._resolve_path(relative_path)
+        # validate_within_boundary returns a clean absolute path with no ".."
+        # segments, so anchoring it is a single concat — no normpath re-parse
+        assert ".." not in resolved.split("/")
+        full_path = "/" + resolved.lstrip("/")
+        if len(self._path_cache) >= 1024:
+            self._path_cache.pop(self._path_cache_order.popleft(), None)
+        self._path_cache[relative_path] = (resolved, full_path)
+        self._path_cache_order.append(relative_path)
+        return (resolved, full_path)
+
+    def _invalidate_stat_cache(self, full_path: str) -> None:
+        """Drop cached stats for a path and everything beneath it.
+
+        Removing or renaming a directory invalidates its descendants'
+        metadata too, not just the top entry; clients.md promises mutating
+        operations invalidate cached stats for the paths they touch.
+        """
+        self._stat_cache.pop(full_path, None)
+        prefix = full_path.rstrip("/") + "/"
+        stale = [p for p in self._stat_cache if p.startswith(prefix)]
+        for p in stale:
+            del self._stat_cache[p]
+
+    def _invalidate_ensured_dirs(self, full_path: str) -> None:
+        """Drop ensured-directory entries at or below a removed/renamed path.
+
+        The set only proves a directory existed when a write last saw it;
+        deleting or renaming that subtree makes those proofs stale, and the
+        next write there must re-issue makedirs.
+        """
+        if not full_path.startswith(self._root_slash):
+            self._ensured_dirs.clear()
+            return
+        rel = full_path[len(self._root_slash):]
+        prefix = rel + "/"
+        stale = [d for d in self._ensured_dirs if d == rel or d.startswith(prefix)]
+        self._ensured_dirs.difference_update(stale)
 
     async def exec(
         self, command: str, options: ExecOptions | None = None
@@ -157,9 +275,9 @@ class RemoteFilesystemBackend:
             raise BackendError("Command cannot be empty", ErrorCode.EMPTY_COMMAND)
 
         if self._prevent_dangerous:
-            if is_dangerous(command):
+            dangerous, safety_check = _check_command_safety(command)
+            if dangerous:
                 raise DangerousOperationError(command)
-            safety_check = is_command_safe(command)
             if not safety_check.safe:
                 raise BackendError(
                     safety_check.reason or "Command failed safety check",
@@ -170,11 +288,14 @@ class RemoteFilesystemBackend:
         await self._ensure_connected()
         assert self._transport is not None
 
-        cwd = options.cwd if options and options.cwd else self._root_dir
-        env_str = ""
-        if options and options.env:
-            env_str = " ".join(f"{k}={v}" for k, v in options.env.items()) + " "
-        full_command = f"cd {cwd} && HOME={cwd} {env_str}{command}"
+        if options is None or (not options.cwd and not options.env):
+            full_command = self._default_exec_prefix + command
+        else:
+            cwd = shlex.quote(options.cwd or self._root_dir)
+            env_str = ""
+            if options.env:
+                env_str = " ".join(f"{k}={v}" for k, v in options.env.items()) + " "
+            full_command = f"cd {cwd} && HOME={cwd} {env_str}{command}"
 
         result = await self._transport.run(full_command, check=False)
 
@@ -199,22 +320,99 @@ class RemoteFilesystemBackend:
                 command,
             )
 
+    async def exec_batch(self, commands: list[str]) -> list[str]:
+        """Run several commands in one SSH exec channel.
+
+        Channel setup and teardown dominate the cost of tiny commands;
+        joining them with a sentinel and splitting the combined output
+        turns N channel round-trips into one.
+        """
+        if not commands:
+            return []
+        for command in commands:
+            if not command.strip():
+                raise BackendError("Command cannot be empty", ErrorCode.EMPTY_COMMAND)
+            # A "#" comments out everything after it on the joined line
+            # (swallowing the sentinel and later commands) and a newline
+            # breaks out of it; neither can be batched safely
+            if "#" in command or "\n" in command or "\r" in command:
+                raise BackendError(
+                    "Batched commands cannot contain '#' or newlines",
+                    ErrorCode.UNSAFE_COMMAND,
+                    command,
+                )
+            if self._prevent_dangerous:
+                dangerous, safety_check = _check_command_safety(command)
+                if dangerous:
+                    raise DangerousOperationError(command)
+                if not safety_check.safe:
+                    raise BackendError(
+                        safety_check.reason or "Command failed safety check",
+                        ErrorCode.UNSAFE_COMMAND,
+                        command,
+                    )
+
+        await self._ensure_connected()
+        assert self._transport is not None
+
+        joined = f" ; echo {_EXEC_BATCH_SENTINEL} ; ".join(commands)
+        full_command = self._batch_exec_prefix + joined
+        result = await self._transport.run(full_command, check=False)
+
+        if result.returncode != 0:
+            error_msg = (result.stderr or result.stdout or "").strip()
+            raise BackendError(
+                f"Batch execution failed with exit code {result.returncode}: {error_msg}",
+                ErrorCode.EXEC_FAILED,
+                joined,
+            )
+        output = result.stdout or ""
+        parts = [part.strip() for part in output.split(_EXEC_BATCH_SENTINEL)]
+        if len(parts) != len(commands):
+            # A command swallowed or emitted the sentinel; results can no
+            # longer be attributed to their commands, so fail loudly
+            raise BackendError(
+                f"Batch output could not be split: expected {len(commands)} "
+                f"parts, got {len(parts)}",
+                ErrorCode.EXEC_FAILED,
+                joined,
+            )
+        return parts
+
     async def read(
         self, relative_path: str, options: ReadOptions | None = None
     ) -> str | bytes:
-        resolved = self._resolve_path(relative_path)
-        full_path = posixpath.normpath(posixpath.join("/", resolved))
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
         sftp = await self._transport.get_sftp()
         try:
-            data = await sftp.getfo(full_path)
-            content = data.read()
-            encoding = options.encoding if options else "utf8"
-            if encoding == "buffer":
-                return content if isinstance(content, bytes) else content.encode("utf-8")
-            return content.decode("utf-8") if isinstance(content, bytes) else content
+            async with sftp.open(full_path, "rb") as f:
+                size = (await f.stat()).size or 0
+                block_size = self._sftp_block_size
+                if size <= block_size:
+                    content = await f.read()
+                else:
+                    # Issue bounded parallel range reads into a preallocated
+                    # buffer so large transfers fill the bandwidth-delay
+                    # product instead of waiting on one request at a time
+                    buf = bytearray(size)
+                    semaphore = asyncio.Semaphore(self._sftp_max_requests)
+
+                    async def read_block(offset: int) -> None:
+                        async with semaphore:
+                            chunk = await f.read(block_size, offset)
+                            buf[offset : offset + len(chunk)] = chunk
+
+                    await asyncio.gather(*(
+                        read_block(offset) for offset in range(0, size, block_size)
+                    ))
+                    content = bytes(buf)
+            # content is always bytes here; only decode when text was requested
+            if options and options.encoding == "buffer":
+                return content
+            return content.decode("utf-8")
         except Exception as e:
             raise BackendError(
                 f"Failed to read file: {relative_path}",
@@ -223,8 +421,7 @@ class RemoteFilesystemBackend:
             ) from e
 
     async def write(self, relative_path: str, content: str | bytes) -> None:
-        resolved = self._resolve_path(relative_path)
-        full_path = posixpath.normpath(posixpath.join("/", resolved))
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
@@ -232,13 +429,40 @@ class RemoteFilesystemBackend:
         try:
             # Ensure parent directory exists (use workspace-relative path
             # because the SFTP server is chrooted to root_dir)
-            parent = posixpath.dirname(full_path)
-            rel_parent = posixpath.relpath(parent, self._root_dir)
-            if rel_parent != ".":
-                await sftp.makedirs(rel_parent, exist_ok=True)
+            # One rfind on the workspace-relative tail replaces the
+            # dirname + prefix-slice pair; idx <= 0 means the file sits
+            # directly in the root and needs no makedirs
+            rel = (
+                full_path[len(self._root_slash):]
+                if full_path.startswith(self._root_slash)
+                else ""
+            )
+            idx = rel.rfind("/")
+            if idx > 0:
+                rel_parent = rel[:idx]
+                if rel_parent not in self._ensured_dirs:
+                    await sftp.makedirs(rel_parent, exist_ok=True)
+                    self._ensured_dirs.add(rel_parent)
             data = content.encode("utf-8") if isinstance(content, str) else content
+            self._stat_cache.pop(full_path, None)
             async with sftp.open(full_path, "wb") as f:
-                await f.write(data)
+                block_size = self._sftp_block_size
+                if len(data) <= block_size:
+                    await f.write(data)
+                else:
+                    # Pipeline WRITE packets instead of stop-and-wait per block:
+                    # keep up to max_requests in flight on the SSH channel so
+                    # throughput is bounded by window x RTT, not request latency
+                    semaphore = asyncio.Semaphore(self._sftp_max_requests)
+
+                    async def write_block(offset: int, chunk: bytes) -> None:
+                        async with semaphore:
+                            await f.write(chunk, offset)
+
+                    await asyncio.gather(*(
+                        write_block(offset, data[offset : offset + block_size])
+                        for offset in range(0, len(data), block_size)
+                    ))
         except Exception as e:
             raise BackendError(
                 f"Failed to write file: {relative_path}",
@@ -247,12 +471,15 @@ class RemoteFilesystemBackend:
             ) from e
 
     async def rename(self, old_path: str, new_path: str) -> None:
-        old_resolved = self._resolve_path(old_path)
-        new_resolved = self._resolve_path(new_path)
+        old_resolved, old_full = self._resolve_full(old_path)
+        new_resolved, new_full = self._resolve_full(new_path)
         await self._ensure_connected()
         assert self._transport is not None
 
         sftp = await self._transport.get_sftp()
+        self._invalidate_stat_cache(old_full)
+        self._invalidate_stat_cache(new_full)
+        self._invalidate_ensured_dirs(old_full)
         try:
             await sftp.rename(old_resolved, new_resolved)
         except Exception as e:
@@ -265,41 +492,41 @@ class RemoteFilesystemBackend:
     async def rm(
         self, relative_path: str, *, recursive: bool = False, force: bool = False
     ) -> None:
-        resolved = self._resolve_path(relative_path)
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
+        # Delete over the multiplexed SFTP channel rather than shelling out
+        # through a fresh exec channel; this also keeps the validated path out
+        # of shell interpolation entirely
+        sftp = await self._transport.get_sftp()
+        self._invalidate_stat_cache(full_path)
+        self._invalidate_ensured_dirs(full_path)
         try:
             if recursive:
-                cmd = f"rm -rf {resolved}" if force else f"rm -r {resolved}"
+                await sftp.rmtree(full_path, ignore_errors=force)
             else:
-                cmd = f"rm -f {resolved}" if force else f"rm {resolved}"
-            result = await self._transport.run(cmd, check=False)
-            if result.returncode != 0 and not force:
-                raise BackendError(
-                    f"Failed to delete: {relative_path}",
-                    ErrorCode.WRITE_FAILED,
-                    (result.stderr or "").strip(),
-                )
-        except BackendError:
-            raise
+                await sftp.remove(full_path)
         except Exception as e:
+            if force:
+                return
             raise BackendError(
                 f"Failed to delete: {relative_path}",
                 ErrorCode.WRITE_FAILED,
                 str(e),
             ) from e
 
-    async def readdir(self, relative_path: str) -> list[str]:
-        resolved = self._resolve_path(relative_path)
-        full_path = posixpath.normpath(posixpath.join("/", resolved))
+    async def readdir(self, relative_path: str, *, sort: bool = True) -> list[str]:
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
         sftp = await self._transport.get_sftp()
         try:
             entries = await sftp.listdir(full_path)
-            return sorted(entries)
+            # Callers doing membership or glob checks can skip the O(N log N)
+            # sort and the extra list copy on large directories
+            return sorted(entries) if sort else entries
         except Exception as e:
             raise BackendError(
                 f"Failed to read directory: {relative_path}",
@@ -308,12 +535,12 @@ class RemoteFilesystemBackend:
             ) from e
 
     async def mkdir(self, relative_path: str, *, recursive: bool = True) -> None:
-        resolved = self._resolve_path(relative_path)
-        full_path = posixpath.normpath(posixpath.join("/", resolved))
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
         sftp = await self._transport.get_sftp()
+        self._stat_cache.pop(full_path, None)
         try:
             if recursive:
                 # Use workspace-relative path because the SFTP server
@@ -330,49 +557,114 @@ class RemoteFilesystemBackend:
             ) from e
 
     async def touch(self, relative_path: str) -> None:
-        resolved = self._resolve_path(relative_path)
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
-        result = await self._transport.run(f"touch {resolved}", check=False)
-        if result.returncode != 0:
+        # Reuse the multiplexed SFTP channel instead of paying a full SSH
+        # exec-channel round-trip for `touch`
+        sftp = await self._transport.get_sftp()
+        self._stat_cache.pop(full_path, None)
+        try:
+            async with sftp.open(full_path, "ab"):
+                pass
+            await sftp.utime(full_path)
+        except Exception as e:
             raise BackendError(
                 f"Failed to touch: {relative_path}",
                 ErrorCode.WRITE_FAILED,
-                (result.stderr or "").strip(),
-            )
+                str(e),
+            ) from e
 
     async def exists(self, relative_path: str) -> bool:
-        resolved = self._resolve_path(relative_path)
+        full_path = self._resolve_full(relative_path)[1]
         await self._ensure_connected()
         assert self._transport is not None
 
-        result = await self._transport.run(f"test -e {resolved}", check=False)
-        return result.returncode == 0
+        sftp = await self._transport.get_sftp()
+        try:
+            await sftp.stat(full_path)
+            return True
+        except SFTPError:
+            # Missing file, permission denied, protocol failure — all mean
+            # "not observable", matching the old `test -e` non-zero exit;
+            # asyncssh types must not leak through the backend abstraction
+            return False
+
+    @staticmethod
+    def _to_file_stat(attrs: object) -> FileStat:
+        ifmt = S_IFMT(attrs.permissions or 0)
+        return FileStat(
+            is_file=ifmt == S_IFREG,
+            is_directory=ifmt == S_IFDIR,
+            size=attrs.size or 0,
+            modified=attrs.mtime or 0.0,
+        )
+
+    def _stat_cache_put(self, full_path: str, stat: FileStat, now: float) -> None:
+        """Insert a stat result, evicting oldest entries past the cap.
+
+        Same deque+cap scheme as _path_cache; the order deque may hold keys
+        already dropped by invalidation, so eviction loops until the dict is
+        actually below the cap.
+        """
+        cache = self._stat_cache
+        if full_path not in cache:
+            while len(cache) >= _STAT_CACHE_MAX and self._stat_cache_order:
+                cache.pop(self._stat_cache_order.popleft(), None)
+            self._stat_cache_order.append(full_path)
+        cache[full_path] = (now, stat)
 
     async def stat(self, relative_path: str) -> FileStat:
-        resolved = self._resolve_path(relative_path)
-        full_path = posixpath.normpath(posixpath.join("/", resolved))
+        full_path = self._resolve_full(relative_path)[1]
+        cached = self._stat_cache.get(full_path)
+        if cached is not None:
+            if time.monotonic() - cached[0] < _STAT_CACHE_TTL:
+                return cached[1]
+            # Expired entries are dead weight until overwritten — drop now
+            self._stat_cache.pop(full_path, None)
         await self._ensure_connected()
         assert self._transport is not None
 
         sftp = await self._transport.get_sftp()
         try:
             attrs = await sftp.stat(full_path)
-            import stat as stat_mod
-
-            return FileStat(
-                is_file=stat_mod.S_ISREG(attrs.permissions or 0),
-                is_directory=stat_mod.S_ISDIR(attrs.permissions or 0),
-                size=attrs.size or 0,
-                modified=attrs.mtime or 0.0,
-            )
         except Exception as e:
             raise BackendError(
                 f"Failed to stat path: {relative_path}",
                 ErrorCode.READ_FAILED,
                 str(e),
             ) from e
+        result = self._to_file_stat(attrs)
+        self._stat_cache_put(full_path, result, time.monotonic())
+        return result
+
+    async def stat_many(self, relative_paths: list[str]) -> list[FileStat]:
+        """Stat many paths at once, pipelining the SFTP requests.
+
+        Results come back in input order; a readdir + per-entry stat walk
+        costs one windowed batch instead of N sequential round-trips.
+        """
+        full_paths = [self._resolve_full(p)[1] for p in relative_paths]
+        await self._ensure_connected()
+        assert self._transport is not None
+
+        sftp = await self._transport.get_sftp()
+        try:
+            attrs_list = await asyncio.gather(*(sftp.stat(p) for p in full_paths))
+        except Exception as e:
+            raise BackendError(
+                f"Failed to stat paths: {relative_paths}",
+                ErrorCode.READ_FAILED,
+                str(e),
+            ) from e
+        now = time.monotonic()
+        results = []
+        for full_path, attrs in zip(full_paths, attrs_list, strict=True):
+            file_stat = self._to_file_stat(attrs)
+            self._stat_cache_put(full_path, file_stat, now)
+            results.append(file_stat)
+        return results
 
     def scope(
         self, scope_path: str, config: ScopeConfig | None = None
@@ -413,16 +705,25 @@ class RemoteFilesystemBackend:
         self._closeables.add(client)
         return client
 
+    @staticmethod
+    async def _safe_close(closeable: Closeable) -> None:
+        try:
+            await closeable.close()
+        except Exception:
+            pass
+
     async def destroy(self) -> None:
         if self._reconnect_task:
             self._reconnect_task.cancel()
             self._reconnect_task = None
 
-        for closeable in list(self._closeables):
-            try:
-                await closeable.close()
-            except Exception:
-                pass
+        # Each close can be a network round-trip; gather so teardown costs
+        # the slowest close instead of the sum of all of them
+        if self._closeables:
+            await asyncio.gather(
+                *(self._safe_close(c) for c in list(self._closeables)),
+                return_exceptions=True,
+            )
         self._closeables.clear()
 
         if self._transport:
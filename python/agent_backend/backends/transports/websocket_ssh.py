@@ -15,6 +15,10 @@ import websockets
 
 logger = logging.getLogger(__name__)
 
+# Default flow-control watermarks for buffered outgoing WebSocket data
+_DEFAULT_HIGH_WATER = 64 * 1024
+_DEFAULT_LOW_WATER = 16 * 1024
+
 
 class _WebSocketTransport(asyncio.Transport):
     """asyncio.Transport that bridges writes to a WebSocket connection."""
@@ -27,9 +31,19 @@ class _WebSocketTransport(asyncio.Transport):
         super().__init__()
         self._ws = ws
         self._protocol = protocol
+        # Cache the loop and the discard bound-method: write runs once per SSH
+        # packet, and ensure_future's loop lookup/dispatch is pure overhead there
+        self._loop = asyncio.get_running_loop()
         self._closing = False
         self._read_task: asyncio.Task[None] | None = None
         self._pending_writes: set[asyncio.Task[None]] = set()
+        self._discard = self._pending_writes.discard
+        self._send_buf = bytearray()
+        self._flush_scheduled = False
+        self._buffer_bytes = 0
+        self._high_water = _DEFAULT_HIGH_WATER
+        self._low_water = _DEFAULT_LOW_WATER
+        self._paused = False
 
     def get_extra_info(self, name: str, default: Any = None) -> Any:
         if name == "peername":
@@ -43,9 +57,70 @@ class _WebSocketTransport(asyncio.Transport):
     def write(self, data: bytes) -> None:
         if self._closing:
             return
-        task = asyncio.ensure_future(self._ws.send(data))
+        # Coalesce writes issued in the same event-loop tick into one frame:
+        # asyncssh emits many small packets back-to-back, and call_soon runs
+        # after all synchronous write() calls have been queued, so ordering
+        # is preserved while N frames collapse into one ws.send
+        self._send_buf += data
+        self._buffer_bytes += len(data)
+        self._maybe_pause()
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if self._closing or not self._send_buf:
+            return
+        data = bytes(self._send_buf)
+        self._send_buf.clear()
+        task = self._loop.create_task(self._ws.send(data))
         self._pending_writes.add(task)
-        task.add_done_callback(self._pending_writes.discard)
+        task.add_done_callback(self._make_done_callback(len(data)))
+
+    def _make_done_callback(self, size: int):
+        discard = self._discard
+
+        def done(task: asyncio.Task[None]) -> None:
+            discard(task)
+            self._buffer_bytes -= size
+            self._maybe_resume()
+
+        return done
+
+    def _maybe_pause(self) -> None:
+        """Ask the producer to pause once buffered bytes cross the high water mark."""
+        if not self._paused and self._buffer_bytes > self._high_water:
+            self._paused = True
+            pause = getattr(self._protocol, "pause_writing", None)
+            if pause is not None:
+                pause()
+
+    def _maybe_resume(self) -> None:
+        if self._paused and self._buffer_bytes <= self._low_water:
+            self._paused = False
+            resume = getattr(self._protocol, "resume_writing", None)
+            if resume is not None:
+                resume()
+
+    def get_write_buffer_size(self) -> int:
+        return self._buffer_bytes
+
+    def get_write_buffer_limits(self) -> tuple[int, int]:
+        return (self._low_water, self._high_water)
+
+    def set_write_buffer_limits(
+        self, high: int | None = None, low: int | None = None
+    ) -> None:
+        if high is None:
+            high = 4 * low if low is not None else _DEFAULT_HIGH_WATER
+        if low is None:
+            low = high // 4
+        if not 0 <= low <= high:
+            raise ValueError("high water mark must be >= low water mark >= 0")
+        self._high_water = high
+        self._low_water = low
+        self._maybe_pause()
 
     def write_eof(self) -> None:
         pass
@@ -56,27 +131,54 @@ class _WebSocketTransport(asyncio.Transport):
     def close(self) -> None:
         if self._closing:
             return
+        self._flush()  # drain any coalesced bytes before tearing down
         self._closing = True
         if self._read_task:
             self._read_task.cancel()
-        task = asyncio.ensure_future(self._ws.close())
+        task = self._loop.create_task(self._ws.close())
         self._pending_writes.add(task)
-        task.add_done_callback(self._pending_writes.discard)
+        task.add_done_callback(self._discard)
 
     def abort(self) -> None:
         self.close()
 
+    async def aclose(self) -> None:
+        """Close after draining in-flight sends, with a bounded wait.
+
+        The sync close() fires ws.close() as a background task and returns,
+        which lets a caller that immediately reconnects race the teardown and
+        can drop tail writes still in _pending_writes. Await those (capped at
+        2s so a dead peer can't hang shutdown) before closing the socket.
+        """
+        if not self._closing:
+            self._flush()
+            self._closing = True
+        if self._read_task:
+            self._read_task.cancel()
+            await asyncio.gather(self._read_task, return_exceptions=True)
+            self._read_task = None
+        if self._pending_writes:
+            await asyncio.wait(self._pending_writes, timeout=2.0)
+        await self._ws.close()
+
     def start_reading(self, protocol: asyncio.Protocol) -> None:
         """Start reading from WebSocket and feeding data to the protocol."""
-        self._read_task = asyncio.ensure_future(self._read_loop(protocol))
+        self._read_task = self._loop.create_task(self._read_loop(protocol))
 
     async def _read_loop(self, protocol: asyncio.Protocol) -> None:
+        # Runs once per inbound frame; bind the two hot lookups to locals and
+        # use an exact type check — SSH traffic is always binary frames, the
+        # str branch exists only for a misbehaving server (latin-1 keeps the
+        # bytes identical without transcoding)
+        recv = self._ws.recv
+        data_received = protocol.data_received
         try:
-            async for message in self._ws:
-                if isinstance(message, bytes):
-                    protocol.data_received(message)
+            while not self._closing:
+                message = await recv()
+                if type(message) is bytes:
+                    data_received(message)
                 else:
-                    protocol.data_received(message.encode())
+                    data_received(message.encode("latin-1"))
         except websockets.ConnectionClosed:
             protocol.connection_lost(None)
         except asyncio.CancelledError:
@@ -96,10 +198,12 @@ class _WebSocketTunnel:
 
     def __init__(self, ws: websockets.ClientConnection) -> None:
         self._ws = ws
+        self._loop = asyncio.get_running_loop()
         self._close_task: asyncio.Task[None] | None = None
+        self.transport: _WebSocketTransport | None = None
 
     def close(self) -> None:
-        self._close_task = asyncio.ensure_future(self._ws.close())
+        self._close_task = self._loop.create_task(self._ws.close())
 
     async def create_connection(
         self,
@@ -109,6 +213,7 @@ class _WebSocketTunnel:
     ) -> tuple[_WebSocketTransport, Any]:
         protocol = protocol_factory()
         transport = _WebSocketTransport(self._ws, protocol)
+        self.transport = transport
         protocol.connection_made(transport)
         transport.start_reading(protocol)
         return transport, protocol
@@ -134,6 +239,7 @@ class WebSocketSSHTransport:
         self._keepalive_interval = keepalive_interval
         self._keepalive_count_max = keepalive_count_max
         self._ws: websockets.ClientConnection | None = None
+        self._tunnel: _WebSocketTunnel | None = None
         self._ssh_conn: asyncssh.SSHClientConnection | None = None
         self._sftp: asyncssh.SFTPClient | None = None
         self._connected = False
@@ -150,12 +256,23 @@ class WebSocketSSHTransport:
             headers["Authorization"] = f"Bearer {self._auth_token}"
 
         ws_url = f"{protocol}://{self._host}:{self._port}/ssh"
-        self._ws = await websockets.connect(ws_url, additional_headers=headers)
+        # Tune the link for an encrypted SSH byte stream: permessage-deflate
+        # only burns CPU on incompressible ciphertext, the frame-size cap just
+        # adds per-frame reallocation, and WS-layer pings would duplicate the
+        # SSH keepalive probes configured below.
+        self._ws = await websockets.connect(
+            ws_url,
+            additional_headers=headers,
+            compression=None,
+            max_size=None,
+            ping_interval=None,
+        )
 
         # Create an SSH connection tunneled over the WebSocket.
         # We wrap the WebSocket in a _WebSocketTunnel that implements the
         # create_connection() interface asyncssh expects for its tunnel param.
         tunnel = _WebSocketTunnel(self._ws)
+        self._tunnel = tunnel
         self._ssh_conn = await asyncssh.connect(
             self._host,
             tunnel=tunnel,
@@ -192,6 +309,12 @@ class WebSocketSSHTransport:
             self._ssh_conn.close()
             await self._ssh_conn.wait_closed()
             self._ssh_conn = None
-        if self._ws:
+        # Drain the tunneled transport so tail writes aren't dropped and a
+        # subsequent reconnect can't race the background close task
+        if self._tunnel is not None and self._tunnel.transport is not None:
+            await self._tunnel.transport.aclose()
+            self._tunnel = None
+            self._ws = None
+        elif self._ws:
             await self._ws.close()
             self._ws = None
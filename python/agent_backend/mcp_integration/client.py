@@ -9,6 +9,42 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamable_http_client
 
+# Pooled HTTP clients shared across MCP sessions, keyed by (timeout, headers).
+# Creating a client per session meant a fresh TCP+TLS handshake every time an
+# agent spun up a scoped MCP client; reusing one keeps connections alive and
+# multiplexes concurrent sessions for the same scope.
+_shared_http_clients: dict[tuple[Any, ...], httpx.AsyncClient] = {}
+
+
+def _get_shared_http_client(headers: dict[str, str], timeout_s: float) -> httpx.AsyncClient:
+    key = (timeout_s, tuple(sorted(headers.items())))
+    client = _shared_http_clients.get(key)
+    if client is None or client.is_closed:
+        try:
+            client = httpx.AsyncClient(
+                headers=headers,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=timeout_s,
+            )
+        except ImportError:  # h2 not installed — HTTP/1.1 keep-alive still pools
+            client = httpx.AsyncClient(
+                headers=headers,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=timeout_s,
+            )
+        _shared_http_clients[key] = client
+    return client
+
+
+async def aclose_shared_http_clients() -> None:
+    """Close all pooled MCP HTTP clients (e.g. on process shutdown)."""
+    clients = list(_shared_http_clients.values())
+    _shared_http_clients.clear()
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
+
 
 async def create_mcp_client(
     backend_type: str,
@@ -57,7 +93,8 @@ async def create_remote_mcp_client(
     mcp_url = f"{url}/mcp"
 
     http_ctx = streamable_http_client(
-        mcp_url, http_client=httpx.AsyncClient(headers=headers)
+        mcp_url,
+        http_client=_get_shared_http_client(headers, connection_timeout_ms / 1000.0),
     )
     read_stream, write_stream, _ = await http_ctx.__aenter__()
     session = ClientSession(read_stream, write_stream)
@@ -200,6 +200,8 @@ class RemoteFilesystemBackendConfig:
     isolation: IsolationMode = IsolationMode.AUTO
     prevent_dangerous: bool = True
     max_output_length: int | None = None
+    sftp_block_size: int = 32768
+    sftp_max_requests: int = 128
 
 
 @dataclass
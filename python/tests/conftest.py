@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
 import pytest
 
 from agent_backend.backends.local import LocalFilesystemBackend
 from agent_backend.backends.memory import MemoryBackend
-from agent_backend.types import LocalFilesystemBackendConfig, MemoryBackendConfig
+from agent_backend.backends.remote import RemoteFilesystemBackend
+from agent_backend.types import (
+    ConnectionStatus,
+    LocalFilesystemBackendConfig,
+    MemoryBackendConfig,
+    RemoteFilesystemBackendConfig,
+)
 
 
 @pytest.fixture
@@ -38,6 +48,136 @@ def empty_memory_backend():
     return MemoryBackend()
 
 
+@pytest.fixture
+def remote_backend():
+    """Create a disconnected RemoteFilesystemBackend for unit tests."""
+    config = RemoteFilesystemBackendConfig(root_dir="/var/workspace", host="localhost")
+    return RemoteFilesystemBackend(config)
+
+
+@dataclass
+class FakeFile:
+    """Hand-rolled SFTP file handle recording calls into plain lists.
+
+    MagicMock allocates a child mock per attribute access, which dominates
+    mock-heavy test runtime; these fakes record arguments directly.
+    """
+
+    stat_size: int = 0
+    read_data: bytes = b""
+    read_side_effect: Any = None
+    read_calls: list[tuple] = field(default_factory=list)
+    write_calls: list[tuple] = field(default_factory=list)
+
+    async def stat(self):
+        return SimpleNamespace(size=self.stat_size)
+
+    async def read(self, *args):
+        self.read_calls.append(args)
+        if self.read_side_effect is not None:
+            return await self.read_side_effect(*args)
+        return self.read_data
+
+    async def write(self, *args):
+        self.write_calls.append(args)
+
+
+class _FakeFileCtx:
+    """sftp.open() is used as `async with sftp.open(...)`, so it must return
+    an async context manager synchronously (not a coroutine)."""
+
+    def __init__(self, file: FakeFile) -> None:
+        self._file = file
+
+    async def __aenter__(self) -> FakeFile:
+        return self._file
+
+    async def __aexit__(self, *exc: object) -> bool:
+        return False
+
+
+@dataclass
+class FakeSftp:
+    """Fake asyncssh SFTP client; call arguments land in *_calls lists."""
+
+    file: FakeFile = field(default_factory=FakeFile)
+    stat_result: Any = None
+    stat_error: Exception | None = None
+    remove_error: Exception | None = None
+    listdir_result: list[str] = field(default_factory=list)
+    open_calls: list[tuple] = field(default_factory=list)
+    makedirs_calls: list[tuple] = field(default_factory=list)
+    stat_calls: list[str] = field(default_factory=list)
+    remove_calls: list[str] = field(default_factory=list)
+    rmtree_calls: list[tuple] = field(default_factory=list)
+    utime_calls: list[str] = field(default_factory=list)
+    listdir_calls: list[str] = field(default_factory=list)
+    rename_calls: list[tuple] = field(default_factory=list)
+
+    def open(self, path: str, mode: str) -> _FakeFileCtx:
+        self.open_calls.append((path, mode))
+        return _FakeFileCtx(self.file)
+
+    async def makedirs(self, path: str, exist_ok: bool = False) -> None:
+        self.makedirs_calls.append((path, exist_ok))
+
+    async def stat(self, path: str):
+        self.stat_calls.append(path)
+        if self.stat_error is not None:
+            raise self.stat_error
+        if self.stat_result is not None:
+            return self.stat_result
+        return SimpleNamespace(permissions=0o100644, size=0, mtime=0.0)
+
+    async def remove(self, path: str) -> None:
+        self.remove_calls.append(path)
+        if self.remove_error is not None:
+            raise self.remove_error
+
+    async def rmtree(self, path: str, ignore_errors: bool = False) -> None:
+        self.rmtree_calls.append((path, ignore_errors))
+
+    async def utime(self, path: str) -> None:
+        self.utime_calls.append(path)
+
+    async def listdir(self, path: str) -> list[str]:
+        self.listdir_calls.append(path)
+        return self.listdir_result
+
+    async def rename(self, old: str, new: str) -> None:
+        self.rename_calls.append((old, new))
+
+
+@dataclass
+class FakeTransport:
+    """Fake WebSocketSSHTransport exposing run() and get_sftp()."""
+
+    sftp: FakeSftp = field(default_factory=FakeSftp)
+    run_result: Any = field(
+        default_factory=lambda: SimpleNamespace(returncode=0, stdout="", stderr="")
+    )
+    run_calls: list[str] = field(default_factory=list)
+
+    async def run(self, command: str, **kwargs: object):
+        self.run_calls.append(command)
+        return self.run_result
+
+    async def get_sftp(self) -> FakeSftp:
+        return self.sftp
+
+
+@pytest.fixture
+def mocked_transport(remote_backend):
+    """Inject a fake transport into remote_backend and mark it connected.
+
+    Returns (transport, sftp, file_handle).
+    """
+    transport = FakeTransport()
+    remote_backend._transport = transport
+    remote_backend._status_manager.set_status(ConnectionStatus.CONNECTED)
+    return transport, transport.sftp, transport.sftp.file
+
+
 @pytest.fixture
 def local_backend(tmp_workspace):
     """Create a LocalFilesystemBackend."""
@@ -12,53 +12,26 @@ from agent_backend.types import PathEscapeError
 
 
 class TestValidateWithinBoundary:
-    def test_relative_path(self):
-        result = validate_within_boundary("file.txt", "/workspace")
-        assert result == "/workspace/file.txt"
-
-    def test_relative_subdir(self):
-        result = validate_within_boundary("subdir/file.txt", "/workspace")
-        assert result == "/workspace/subdir/file.txt"
-
-    def test_dot_path(self):
-        result = validate_within_boundary(".", "/workspace")
-        assert result == "/workspace"
-
-    def test_absolute_matching_boundary(self):
-        result = validate_within_boundary("/workspace/file.txt", "/workspace")
-        assert result == "/workspace/file.txt"
-
-    def test_absolute_matching_boundary_subdir(self):
-        result = validate_within_boundary("/workspace/a/b/c", "/workspace")
-        assert result == "/workspace/a/b/c"
-
-    def test_absolute_not_matching_treated_as_relative(self):
-        result = validate_within_boundary("/file.txt", "/workspace")
-        assert result == "/workspace/file.txt"
-
-    def test_absolute_etc_passwd_treated_as_relative(self):
-        result = validate_within_boundary("/etc/passwd", "/workspace")
-        assert result == "/workspace/etc/passwd"
-
-    def test_escape_via_parent_directory(self):
-        with pytest.raises(PathEscapeError):
-            validate_within_boundary("../etc/passwd", "/workspace")
-
-    def test_escape_via_complex_traversal(self):
-        with pytest.raises(PathEscapeError):
-            validate_within_boundary("a/b/../../../../etc", "/workspace")
-
-    def test_escape_via_root_traversal(self):
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("file.txt", "/workspace/file.txt"),
+            ("subdir/file.txt", "/workspace/subdir/file.txt"),
+            (".", "/workspace"),
+            ("/workspace/file.txt", "/workspace/file.txt"),
+            ("/workspace/a/b/c", "/workspace/a/b/c"),
+            ("/file.txt", "/workspace/file.txt"),
+            ("/etc/passwd", "/workspace/etc/passwd"),
+            ("/workspace", "/workspace"),
+        ],
+    )
+    def test_resolution(self, path, expected):
+        assert validate_within_boundary(path, "/workspace") == expected
+
+    @pytest.mark.parametrize("path", ["../etc/passwd", "a/b/../../../../etc", "../../.."])
+    def test_escapes(self, path):
         with pytest.raises(PathEscapeError):
-            validate_within_boundary("../../..", "/workspace")
-
-    def test_posix_mode(self):
-        result = validate_within_boundary("file.txt", "/workspace", use_posix=True)
-        assert result == "/workspace/file.txt"
-
-    def test_boundary_exact_match(self):
-        result = validate_within_boundary("/workspace", "/workspace")
-        assert result == "/workspace"
+            validate_within_boundary(path, "/workspace")
 
 
 class TestValidateWithinBoundaryPosix:
@@ -68,33 +41,23 @@ class TestValidateWithinBoundaryPosix:
     resolution cases and escape prevention must work in this mode.
     """
 
-    def test_posix_relative_path(self):
-        result = validate_within_boundary("file.txt", "/workspace", use_posix=True)
-        assert result == "/workspace/file.txt"
-
-    def test_posix_relative_subdir(self):
-        result = validate_within_boundary("subdir/file.txt", "/workspace", use_posix=True)
-        assert result == "/workspace/subdir/file.txt"
-
-    def test_posix_absolute_matching_boundary(self):
-        result = validate_within_boundary("/workspace/file.txt", "/workspace", use_posix=True)
-        assert result == "/workspace/file.txt"
-
-    def test_posix_absolute_matching_boundary_subdir(self):
-        result = validate_within_boundary("/workspace/a/b/c", "/workspace", use_posix=True)
-        assert result == "/workspace/a/b/c"
-
-    def test_posix_absolute_not_matching_treated_as_relative(self):
-        result = validate_within_boundary("/etc/passwd", "/workspace", use_posix=True)
-        assert result == "/workspace/etc/passwd"
-
-    def test_posix_escape_via_parent_directory(self):
-        with pytest.raises(PathEscapeError):
-            validate_within_boundary("../etc/passwd", "/workspace", use_posix=True)
-
-    def test_posix_escape_via_complex_traversal(self):
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("file.txt", "/workspace/file.txt"),
+            ("subdir/file.txt", "/workspace/subdir/file.txt"),
+            ("/workspace/file.txt", "/workspace/file.txt"),
+            ("/workspace/a/b/c", "/workspace/a/b/c"),
+            ("/etc/passwd", "/workspace/etc/passwd"),
+        ],
+    )
+    def test_posix_resolution(self, path, expected):
+        assert validate_within_boundary(path, "/workspace", use_posix=True) == expected
+
+    @pytest.mark.parametrize("path", ["../etc/passwd", "a/b/../../../../etc", "../../.."])
+    def test_posix_escapes(self, path):
         with pytest.raises(PathEscapeError):
-            validate_within_boundary("a/b/../../../../etc", "/workspace", use_posix=True)
+            validate_within_boundary(path, "/workspace", use_posix=True)
 
 
 class TestValidateAbsoluteWithinRoot:
@@ -6,7 +6,7 @@ Marked with @pytest.mark.integration.
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
 
 import pytest
 
@@ -15,6 +15,7 @@ from agent_backend.types import (
     BackendType,
     ConnectionStatus,
     PathEscapeError,
+    ReadOptions,
     RemoteFilesystemBackendConfig,
 )
 
@@ -57,7 +58,7 @@ class TestRemoteBackendUnit:
         await backend.destroy()
         assert backend.status == ConnectionStatus.DESTROYED
 
-    def test_status_change_callback(self):
+    async def test_status_change_callback(self):
         config = RemoteFilesystemBackendConfig(
             root_dir="/workspace",
             host="localhost",
@@ -65,10 +66,7 @@ class TestRemoteBackendUnit:
         backend = RemoteFilesystemBackend(config)
         events = []
         backend.on_status_change(lambda e: events.append(e))
-        # Manually trigger destroy to test callback
-        import asyncio
-
-        asyncio.get_event_loop().run_until_complete(backend.destroy())
+        await backend.destroy()
         assert len(events) == 1
         assert events[0].to_status == ConnectionStatus.DESTROYED
 
@@ -76,117 +74,343 @@ class TestRemoteBackendUnit:
 class TestRemoteBackendPathResolution:
     """Unit tests for _resolve_path on RemoteFilesystemBackend."""
 
-    def _make_backend(self, root_dir="/var/workspace"):
-        config = RemoteFilesystemBackendConfig(root_dir=root_dir, host="localhost")
-        return RemoteFilesystemBackend(config)
-
-    def test_resolve_relative_path(self):
-        backend = self._make_backend()
-        assert backend._resolve_path("file.txt") == "/var/workspace/file.txt"
-        assert backend._resolve_path("sub/dir/file.txt") == "/var/workspace/sub/dir/file.txt"
-
-    def test_resolve_absolute_matching_root(self):
-        backend = self._make_backend()
-        assert backend._resolve_path("/var/workspace/file.txt") == "/var/workspace/file.txt"
-        assert backend._resolve_path("/var/workspace/a/b") == "/var/workspace/a/b"
-
-    def test_resolve_absolute_not_matching_treated_as_relative(self):
-        backend = self._make_backend()
-        assert backend._resolve_path("/etc/passwd") == "/var/workspace/etc/passwd"
-        assert backend._resolve_path("/file.txt") == "/var/workspace/file.txt"
-
-    def test_resolve_path_escape_raises(self):
-        backend = self._make_backend()
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("file.txt", "/var/workspace/file.txt"),
+            ("sub/dir/file.txt", "/var/workspace/sub/dir/file.txt"),
+            ("/var/workspace/file.txt", "/var/workspace/file.txt"),
+            ("/var/workspace/a/b", "/var/workspace/a/b"),
+            ("/etc/passwd", "/var/workspace/etc/passwd"),
+            ("/file.txt", "/var/workspace/file.txt"),
+        ],
+    )
+    def test_resolve(self, remote_backend, path, expected):
+        assert remote_backend._resolve_path(path) == expected
+
+    @pytest.mark.parametrize("path", ["../etc/passwd", "a/../../.."])
+    def test_resolve_path_escape_raises(self, remote_backend, path):
         with pytest.raises(PathEscapeError):
-            backend._resolve_path("../etc/passwd")
-        with pytest.raises(PathEscapeError):
-            backend._resolve_path("a/../../..")
+            remote_backend._resolve_path(path)
 
 
 class TestRemoteBackendFileOps:
-    """Unit tests for write/mkdir/readdir/exec with mocked transport."""
-
-    def _make_backend(self, root_dir="/var/workspace"):
-        config = RemoteFilesystemBackendConfig(root_dir=root_dir, host="localhost")
-        return RemoteFilesystemBackend(config)
-
-    def _mock_transport(self, backend):
-        """Inject a mocked transport and mark the backend as connected."""
-        transport = MagicMock()
-        transport.run = AsyncMock()
-        sftp = AsyncMock()
-        file_handle = AsyncMock()
-        # sftp.open() is used as `async with sftp.open(...)`, NOT `await sftp.open(...)`,
-        # so it must return an async context manager synchronously (not a coroutine).
-        ctx = MagicMock()
-        ctx.__aenter__ = AsyncMock(return_value=file_handle)
-        ctx.__aexit__ = AsyncMock(return_value=False)
-        sftp.open = MagicMock(return_value=ctx)
-        transport.get_sftp = AsyncMock(return_value=sftp)
-        backend._transport = transport
-        backend._status_manager.set_status(ConnectionStatus.CONNECTED)
-        return transport, sftp, file_handle
-
-    async def test_write_uses_relative_path_for_makedirs(self):
+    """Unit tests for write/mkdir/readdir/exec with a fake transport.
+
+    The backend and fake tree come from the shared remote_backend /
+    mocked_transport fixtures in conftest.py; fakes record call arguments
+    into plain lists instead of MagicMock call objects.
+    """
+
+    async def test_write_uses_relative_path_for_makedirs(self, remote_backend, mocked_transport):
         """makedirs must receive a workspace-relative path, not an absolute one.
         The bug: absolute paths like /var/workspace/sub caused the chrooted
         SFTP server to create /var/workspace/var/workspace/sub."""
-        backend = self._make_backend("/var/workspace")
-        _transport, sftp, _fh = self._mock_transport(backend)
+        backend = remote_backend
+        _transport, sftp, _fh = mocked_transport
 
         await backend.write("sub/file.txt", "content")
 
-        sftp.makedirs.assert_called_once_with("sub", exist_ok=True)
-        sftp.open.assert_called_once_with("/var/workspace/sub/file.txt", "wb")
+        assert sftp.makedirs_calls == [("sub", True)]
+        assert sftp.open_calls == [("/var/workspace/sub/file.txt", "wb")]
 
-    async def test_write_at_root_skips_makedirs(self):
+    async def test_write_at_root_skips_makedirs(self, remote_backend, mocked_transport):
         """Writing a file directly in the workspace root should not call makedirs."""
-        backend = self._make_backend("/var/workspace")
-        _transport, sftp, _fh = self._mock_transport(backend)
+        backend = remote_backend
+        _transport, sftp, _fh = mocked_transport
 
         await backend.write("test.txt", "hello")
 
-        sftp.makedirs.assert_not_called()
-        sftp.open.assert_called_once_with("/var/workspace/test.txt", "wb")
+        assert sftp.makedirs_calls == []
+        assert sftp.open_calls == [("/var/workspace/test.txt", "wb")]
 
-    async def test_write_nested_path_makedirs_receives_relative_parent(self):
-        backend = self._make_backend("/var/workspace")
-        _transport, sftp, _fh = self._mock_transport(backend)
+    async def test_write_nested_path_makedirs_receives_relative_parent(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _fh = mocked_transport
 
         await backend.write("a/b/c/file.txt", "data")
 
-        sftp.makedirs.assert_called_once_with("a/b/c", exist_ok=True)
-        sftp.open.assert_called_once_with("/var/workspace/a/b/c/file.txt", "wb")
+        assert sftp.makedirs_calls == [("a/b/c", True)]
+        assert sftp.open_calls == [("/var/workspace/a/b/c/file.txt", "wb")]
+
+    async def test_write_skips_makedirs_for_already_ensured_dir(self, remote_backend, mocked_transport):
+        """A second write into the same directory should not re-issue makedirs."""
+        backend = remote_backend
+        _transport, sftp, _fh = mocked_transport
+
+        await backend.write("sub/one.txt", "a")
+        await backend.write("sub/two.txt", "b")
+
+        assert sftp.makedirs_calls == [("sub", True)]
+
+    async def test_rm_invalidates_ensured_dirs(self, remote_backend, mocked_transport):
+        """Deleting a directory must make the next write there re-issue makedirs."""
+        backend = remote_backend
+        _transport, sftp, _fh = mocked_transport
+
+        await backend.write("sub/a.txt", "a")
+        await backend.rm("sub", recursive=True, force=True)
+        await backend.write("sub/b.txt", "b")
+
+        assert sftp.makedirs_calls == [("sub", True), ("sub", True)]
+
+    async def test_rename_invalidates_ensured_dirs(self, remote_backend, mocked_transport):
+        """Renaming a directory away must drop ensured entries beneath it."""
+        backend = remote_backend
+        _transport, sftp, _fh = mocked_transport
+
+        await backend.write("sub/deep/a.txt", "a")
+        await backend.rename("sub", "moved")
+        await backend.write("sub/deep/b.txt", "b")
+
+        assert sftp.makedirs_calls == [("sub/deep", True), ("sub/deep", True)]
+
+    async def test_read_small_file_single_read(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, _sftp, fh = mocked_transport
+        fh.stat_size = 5
+        fh.read_data = b"hello"
+
+        result = await backend.read("small.txt")
+
+        assert result == "hello"
+        assert fh.read_calls == [()]
 
-    async def test_mkdir_recursive_uses_relative_path(self):
-        backend = self._make_backend("/var/workspace")
-        _transport, sftp, _ = self._mock_transport(backend)
+    async def test_read_large_file_parallel_blocks(self, remote_backend, mocked_transport):
+        """Files larger than one block are fetched as parallel range reads."""
+        backend = remote_backend
+        _transport, _sftp, fh = mocked_transport
+        block = backend._sftp_block_size
+        data = b"a" * block + b"b" * block + b"c" * 7
+        fh.stat_size = len(data)
+
+        async def fake_read(size, offset):
+            return data[offset : offset + size]
+
+        fh.read_side_effect = fake_read
+
+        result = await backend.read("big.bin", ReadOptions(encoding="buffer"))
+
+        assert result == data
+        assert len(fh.read_calls) == 3
+
+    async def test_write_small_content_single_write(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, _sftp, fh = mocked_transport
+
+        await backend.write("small.txt", "hello")
+
+        assert fh.write_calls == [(b"hello",)]
+
+    async def test_write_large_content_pipelines_blocks(self, remote_backend, mocked_transport):
+        """Content larger than one block is written as concurrent offset writes."""
+        backend = remote_backend
+        _transport, _sftp, fh = mocked_transport
+
+        block = backend._sftp_block_size
+        await backend.write("big.bin", b"x" * (block * 3))
+
+        assert len(fh.write_calls) == 3
+        offsets = sorted(call[1] for call in fh.write_calls)
+        assert offsets == [0, block, block * 2]
+
+    async def test_mkdir_recursive_uses_relative_path(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
 
         await backend.mkdir("sub/dir", recursive=True)
 
-        sftp.makedirs.assert_called_once_with("sub/dir", exist_ok=True)
+        assert sftp.makedirs_calls == [("sub/dir", True)]
 
-    async def test_readdir_passes_full_path_to_listdir(self):
-        backend = self._make_backend("/var/workspace")
-        _transport, sftp, _ = self._mock_transport(backend)
-        sftp.listdir = AsyncMock(return_value=["a.txt", "b.txt"])
+    async def test_readdir_passes_full_path_to_listdir(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.listdir_result = ["a.txt", "b.txt"]
 
         result = await backend.readdir("subdir")
 
-        sftp.listdir.assert_called_once_with("/var/workspace/subdir")
+        assert sftp.listdir_calls == ["/var/workspace/subdir"]
         assert result == ["a.txt", "b.txt"]
 
-    async def test_exec_wraps_command_with_cd_and_home(self):
-        backend = self._make_backend("/var/workspace")
-        transport, _sftp, _ = self._mock_transport(backend)
-        run_result = MagicMock()
-        run_result.returncode = 0
-        run_result.stdout = "ok"
-        transport.run.return_value = run_result
+    async def test_exists_uses_sftp_stat(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+
+        assert await backend.exists("file.txt") is True
+        assert sftp.stat_calls == ["/var/workspace/file.txt"]
+
+    async def test_exists_false_on_missing_file(self, remote_backend, mocked_transport):
+        from asyncssh import SFTPNoSuchFile
+
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.stat_error = SFTPNoSuchFile("no such file")
+
+        assert await backend.exists("missing.txt") is False
+
+    async def test_exists_false_on_sftp_error(self, remote_backend, mocked_transport):
+        """Any SFTP failure means "not observable", like `test -e`'s non-zero exit."""
+        from asyncssh import SFTPPermissionDenied
+
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.stat_error = SFTPPermissionDenied("permission denied")
+
+        assert await backend.exists("forbidden.txt") is False
+
+    async def test_touch_creates_via_sftp(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        transport, sftp, _ = mocked_transport
+
+        await backend.touch("new.txt")
+
+        assert sftp.open_calls == [("/var/workspace/new.txt", "ab")]
+        assert sftp.utime_calls == ["/var/workspace/new.txt"]
+        assert transport.run_calls == []
+
+    async def test_rm_file_uses_sftp_remove(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        transport, sftp, _ = mocked_transport
+
+        await backend.rm("old.txt")
+
+        assert sftp.remove_calls == ["/var/workspace/old.txt"]
+        assert transport.run_calls == []
+
+    async def test_rm_recursive_uses_sftp_rmtree(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+
+        await backend.rm("subdir", recursive=True, force=True)
+
+        assert sftp.rmtree_calls == [("/var/workspace/subdir", True)]
+
+    async def test_rm_force_suppresses_missing_file(self, remote_backend, mocked_transport):
+        from asyncssh import SFTPNoSuchFile
+
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.remove_error = SFTPNoSuchFile("no such file")
+
+        await backend.rm("missing.txt", force=True)
+
+    async def test_stat_result_cached_within_ttl(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.stat_result = SimpleNamespace(permissions=0o100644, size=10, mtime=1.0)
+
+        first = await backend.stat("file.txt")
+        second = await backend.stat("file.txt")
+
+        assert first is second
+        assert sftp.stat_calls == ["/var/workspace/file.txt"]
+
+    async def test_write_invalidates_stat_cache(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.stat_result = SimpleNamespace(permissions=0o100644, size=10, mtime=1.0)
+
+        await backend.stat("file.txt")
+        await backend.write("file.txt", "new content")
+        await backend.stat("file.txt")
+
+        assert len(sftp.stat_calls) == 2
+
+    async def test_rm_recursive_invalidates_descendant_stats(
+        self, remote_backend, mocked_transport
+    ):
+        """Deleting a directory must drop cached stats for files beneath it."""
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.stat_result = SimpleNamespace(permissions=0o100644, size=10, mtime=1.0)
+
+        await backend.stat("sub/a.txt")
+        await backend.rm("sub", recursive=True, force=True)
+        await backend.stat("sub/a.txt")
+
+        assert sftp.stat_calls == ["/var/workspace/sub/a.txt", "/var/workspace/sub/a.txt"]
+
+    def test_stat_cache_is_bounded(self, remote_backend):
+        """A long tree-walk must not grow the stat cache past its cap."""
+        from agent_backend.backends.remote import _STAT_CACHE_MAX
+
+        backend = remote_backend
+        for i in range(_STAT_CACHE_MAX + 100):
+            backend._stat_cache_put(f"/var/workspace/f{i}", object(), 0.0)
+
+        assert len(backend._stat_cache) <= _STAT_CACHE_MAX
+
+    async def test_stat_many_pipelines_requests(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        _transport, sftp, _ = mocked_transport
+        sftp.stat_result = SimpleNamespace(permissions=0o040755, size=0, mtime=2.0)
+
+        results = await backend.stat_many(["a", "b", "c"])
+
+        assert len(results) == 3
+        assert all(r.is_directory for r in results)
+        assert len(sftp.stat_calls) == 3
+
+    async def test_exec_batch_single_run_splits_output(self, remote_backend, mocked_transport):
+        """Batched commands share one SSH exec channel and split on the sentinel."""
+        backend = remote_backend
+        transport, _sftp, _ = mocked_transport
+        transport.run_result = SimpleNamespace(
+            returncode=0,
+            stdout="one\n__ABE_SEP__\ntwo\n__ABE_SEP__\nthree\n",
+            stderr="",
+        )
+
+        results = await backend.exec_batch(["echo one", "echo two", "echo three"])
+
+        assert len(transport.run_calls) == 1
+        assert transport.run_calls[0].startswith(
+            "cd /var/workspace && export HOME=/var/workspace ; "
+        )
+        assert results == ["one", "two", "three"]
+
+    async def test_exec_batch_rejects_comment_character(self, remote_backend, mocked_transport):
+        """A '#' would comment out the sentinel and every later command."""
+        from agent_backend.types import BackendError
+
+        backend = remote_backend
+        transport, _sftp, _ = mocked_transport
+
+        with pytest.raises(BackendError):
+            await backend.exec_batch(["echo hi # tail", "echo two"])
+        assert transport.run_calls == []
+
+    async def test_exec_batch_raises_on_output_arity_mismatch(
+        self, remote_backend, mocked_transport
+    ):
+        """Fewer output parts than commands means results cannot be attributed."""
+        from agent_backend.types import BackendError
+
+        backend = remote_backend
+        transport, _sftp, _ = mocked_transport
+        transport.run_result = SimpleNamespace(returncode=0, stdout="one\n", stderr="")
+
+        with pytest.raises(BackendError):
+            await backend.exec_batch(["echo one", "echo two"])
+
+    async def test_exec_batch_rejects_dangerous_command(self, remote_backend, mocked_transport):
+        from agent_backend.types import DangerousOperationError
+
+        backend = remote_backend
+        transport, _sftp, _ = mocked_transport
+
+        with pytest.raises(DangerousOperationError):
+            await backend.exec_batch(["echo ok", "rm -rf /"])
+        assert transport.run_calls == []
+
+    async def test_exec_wraps_command_with_cd_and_home(self, remote_backend, mocked_transport):
+        backend = remote_backend
+        transport, _sftp, _ = mocked_transport
+        transport.run_result = SimpleNamespace(returncode=0, stdout="ok", stderr="")
 
         await backend.exec("echo hello")
 
-        transport.run.assert_called_once()
-        cmd = transport.run.call_args[0][0]
+        assert len(transport.run_calls) == 1
+        cmd = transport.run_calls[0]
         assert cmd.startswith("cd /var/workspace && HOME=/var/workspace ")
         assert "echo hello" in cmd
@@ -61,3 +61,44 @@ class TestVercelAIAdapter:
 
         assert client is fake_client
         backend.track_closeable.assert_called_once_with(fake_client)
+
+    async def test_http_client_reused_across_connections(self):
+        """Test that _get_http_client returns the same shared client."""
+        backend = AsyncMock()
+        adapter = VercelAIAdapter(backend)
+
+        first = adapter._get_http_client({"Authorization": "Bearer abc"})
+        second = adapter._get_http_client({"Authorization": "Bearer abc"})
+
+        assert first is second
+        assert first.headers["Authorization"] == "Bearer abc"
+        backend.track_closeable.assert_called_once_with(adapter)
+        await adapter.aclose()
+
+    async def test_http_client_not_shared_across_header_sets(self):
+        """Different header sets must get different clients: a scoped session's
+        headers must not bleed onto a later unscoped one."""
+        backend = AsyncMock()
+        adapter = VercelAIAdapter(backend)
+
+        scoped = adapter._get_http_client(
+            {"Authorization": "Bearer abc", "X-Scope-Path": "users/alice"}
+        )
+        unscoped = adapter._get_http_client({"Authorization": "Bearer abc"})
+
+        assert scoped is not unscoped
+        assert "X-Scope-Path" not in unscoped.headers
+        await adapter.aclose()
+
+    async def test_aclose_skips_user_provided_client(self):
+        """Test that aclose doesn't close a client the adapter doesn't own."""
+        import httpx
+
+        backend = AsyncMock()
+        user_client = httpx.AsyncClient()
+        adapter = VercelAIAdapter(backend, http_client=user_client)
+
+        assert adapter._get_http_client({}) is user_client
+        await adapter.aclose()
+        assert not user_client.is_closed
+        await user_client.aclose()
@@ -3,6 +3,11 @@
 import agent_backend
 
 
+def test_version() -> None:
+    """Test that the package exposes its version string."""
+    assert agent_backend.__version__
+
+
 def test_package_imports() -> None:
     """Test that package can be imported."""
     assert agent_backend is not None